@@ -21,12 +21,20 @@ def main():
 
     # Docker部署
     docker_parser = subparsers.add_parser("docker", help="Docker部署")
-    docker_parser.add_argument("action", choices=["start", "stop", "status", "cleanup"])
+    docker_parser.add_argument(
+        "action", choices=["start", "stop", "pause", "unpause", "status", "cleanup"]
+    )
     docker_parser.add_argument("--dev", action="store_true", help="开发模式")
     docker_parser.add_argument("--searxng", action="store_true", help="启用SearXNG")
     docker_parser.add_argument("--host", default="127.0.0.1", help="服务器地址")
     docker_parser.add_argument("--port", type=int, default=8000, help="服务器端口")
     docker_parser.add_argument("--deep", action="store_true", help="深度清理（仅用于cleanup）")
+    docker_parser.add_argument(
+        "--recreate", action="store_true", help="强制重建容器（仅用于start）"
+    )
+    docker_parser.add_argument(
+        "--no-cache", action="store_true", help="构建镜像时不使用缓存（仅用于start）"
+    )
     docker_parser.add_argument(
         "--mode",
         choices=["core", "web"],
@@ -82,6 +90,8 @@ async def handle_docker_command(deployment_manager, args):
             "enable_searxng": args.searxng,
             "host": args.host,
             "port": args.port,
+            "recreate": args.recreate,
+            "no_cache": args.no_cache,
         }
 
         # 如果指定了mode，添加到参数中
@@ -103,6 +113,14 @@ async def handle_docker_command(deployment_manager, args):
         result = await deployment_manager.stop(DeploymentType.DOCKER)
         print(f"Docker停止结果: {'成功' if result else '失败'}")
 
+    elif args.action == "pause":
+        result = await deployment_manager.pause(DeploymentType.DOCKER)
+        print(f"Docker暂停结果: {'成功' if result else '失败'}")
+
+    elif args.action == "unpause":
+        result = await deployment_manager.unpause(DeploymentType.DOCKER)
+        print(f"Docker恢复结果: {'成功' if result else '失败'}")
+
     elif args.action == "status":
         result = await deployment_manager.status(DeploymentType.DOCKER)
         print(f"Docker状态: {result}")
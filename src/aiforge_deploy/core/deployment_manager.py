@@ -102,6 +102,22 @@ class DeploymentManager:
 
         return await provider.stop()
 
+    async def pause(self, deployment_type: DeploymentType) -> bool:
+        """暂停部署"""
+        provider = self.providers.get(deployment_type)
+        if not provider or not hasattr(provider, "pause"):
+            raise ValueError(f"Unsupported deployment type: {deployment_type}")
+
+        return await provider.pause()
+
+    async def unpause(self, deployment_type: DeploymentType) -> bool:
+        """恢复已暂停的部署"""
+        provider = self.providers.get(deployment_type)
+        if not provider or not hasattr(provider, "unpause"):
+            raise ValueError(f"Unsupported deployment type: {deployment_type}")
+
+        return await provider.unpause()
+
     async def cleanup(self, deployment_type: DeploymentType) -> bool:
         """清理部署资源"""
         provider = self.providers.get(deployment_type)
@@ -1,14 +1,246 @@
 import asyncio
+import functools
+import hashlib
+import json
+import os
+import re
+import shutil
+import stat
+import subprocess
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass
 from pathlib import Path
-from typing import Dict, Any
+from typing import Dict, Any, List, Optional, Tuple
+from urllib.parse import urlsplit
 from ..core.deployment_manager import BaseDeploymentProvider
 from .compose_generator import ComposeGenerator
 from aiforge import AIForgeI18nManager
 
+try:
+    import yaml
+
+    _HAS_YAML = True
+except ImportError:
+    yaml = None
+    _HAS_YAML = False
+
+
+@dataclass(frozen=True)
+class DockerEnvironment:
+    """Docker环境探测结果"""
+
+    docker_available: bool
+    docker_running: bool
+    # 可用的compose命令前缀，未找到时为空
+    compose_command: Tuple[str, ...] = ()
+
+    @property
+    def compose_available(self) -> bool:
+        return bool(self.compose_command)
+
+
+# nginx代理SearXNG对外暴露的端口
+SEARXNG_PORT = 55510
+
+# 构建输出中需要显示的关键行，兼容经典构建器与BuildKit plain输出（"#5 ..."、"#5 1.23 ..."）
+BUILD_LINE_PATTERN = re.compile(
+    r"^(?:#\d+ (?:\d+\.\d+ )?)?(?:[0-9a-f]{12}: )?"
+    r"(Step|\[|Successfully built|Successfully tagged|ERROR|FAILED"
+    r"|Downloading|Extracting|Pull complete)"
+)
+BUILD_LINE_ICONS = {
+    "Step": "🔧",
+    "[": "🔧",
+    "Successfully built": "✅",
+    "Successfully tagged": "✅",
+    "ERROR": "❌",
+    "FAILED": "❌",
+    "Downloading": "⬇️",
+    "Extracting": "⬇️",
+    "Pull complete": "⬇️",
+}
+BUILD_OUTPUT_CHUNK_SIZE = 64 * 1024
+
+# 本地状态目录，存放构建器配置与SearXNG配置确认标记，不放入挂载到容器的目录
+AIFORGE_STATE_DIR = Path.home() / ".aiforge"
+
+# SearXNG配置文件（保持原始路径：根目录下的searxng/settings.yml）
+SEARXNG_SETTINGS_FILE = Path("searxng/settings.yml")
+
+# SearXNG需要开启的输出格式
+SEARXNG_REQUIRED_FORMATS = ("html", "json", "csv", "rss")
+SEARXNG_FORMATS_HASH = hashlib.sha256(",".join(SEARXNG_REQUIRED_FORMATS).encode()).hexdigest()[:16]
+
+# search.formats 的规范写法（行内列表或块列表，顺序与SEARXNG_REQUIRED_FORMATS一致），
+# 匹配成功即可确认配置无需更新，否则回退到完整YAML解析
+_FLOW_FORMATS = (
+    rb"\[[ \t]*"
+    + rb"[ \t]*,[ \t]*".join(fmt.encode() for fmt in SEARXNG_REQUIRED_FORMATS)
+    + rb"[ \t]*\][ \t]*(?:\r?\n|\Z)"
+)
+# 列表项缩进取自第一项，之后（跳过空行）不能再有同级列表项或更深的续行
+_BLOCK_FORMATS = (
+    rb"\r?\n(?P<item>[ \t]*)"
+    + rb"(?P=item)".join(
+        rb"-[ \t]+" + fmt.encode() + rb"[ \t]*(?:\r?\n|\Z)" for fmt in SEARXNG_REQUIRED_FORMATS
+    )
+    + rb"(?!(?:[ \t]*\r?\n)*(?P=item)[ \t-])"
+)
+# formats 之前的search子级内容：空行、更深层的嵌套行，或同级的其他键
+_SEARCH_CHILD_LINES = (
+    rb"(?:[ \t]*\r?\n"
+    rb"|(?P=indent)[ \t]+[^\r\n]*\r?\n"
+    rb"|(?P=indent)(?!formats:)\S[^\r\n]*\r?\n)*?"
+)
+SEARXNG_FORMATS_PATTERN = re.compile(
+    rb"^search:[ \t]*\r?\n(?:[ \t]*\r?\n)*"
+    # 第一个子键的缩进即search的子级缩进，formats必须位于该层级，嵌套更深的同名键不算
+    + rb"(?P<indent>[ \t]+)(?=\S)"
+    + rb"(?:(?!formats:)[^\r\n]*\r?\n"
+    + _SEARCH_CHILD_LINES
+    + rb"(?P=indent))?"
+    + rb"formats:[ \t]*(?:"
+    + _FLOW_FORMATS
+    + rb"|"
+    + _BLOCK_FORMATS
+    + rb")",
+    re.MULTILINE,
+)
+
+# 配置AIFORGE_REGISTRY_MIRROR时使用的buildx构建器及其buildkitd配置
+MIRROR_BUILDER_NAME = "aiforge-mirror"
+MIRROR_BUILDKIT_CONFIG = AIFORGE_STATE_DIR / "buildkitd.toml"
+
+# buildkitd运行在docker-container构建器容器内，这些地址指向该容器而非宿主机
+_LOOPBACK_HOSTS = ("localhost", "127.0.0.1", "::1")
+
+# 环境探测命令的超时时间（秒），避免守护进程无响应时无限等待
+PROBE_TIMEOUT = 5
+
+
+def _toml_string(value: str) -> str:
+    """转换为TOML基本字符串，JSON字符串转义与其兼容"""
+    return json.dumps(value)
+
+
+def _buildkit_mirror_config(mirror_url: str) -> Tuple[str, str]:
+    """根据镜像加速地址生成buildkitd.toml内容，返回 (配置内容, 镜像主机)
+
+    未指定协议时按https处理；http地址需额外声明 http = true，否则BuildKit会以HTTPS访问。
+    """
+    if "://" not in mirror_url:
+        mirror_url = f"https://{mirror_url}"
+    parts = urlsplit(mirror_url)
+    if parts.scheme not in ("http", "https") or not parts.netloc:
+        raise ValueError(f"Invalid registry mirror: {mirror_url}")
+
+    # mirrors 只接受主机（可带路径），协议通过对应主机的registry配置声明
+    host = parts.netloc
+    mirror = host + parts.path.rstrip("/")
+
+    config_content = f'[registry."docker.io"]\n  mirrors = [{_toml_string(mirror)}]\n'
+    if parts.scheme == "http":
+        config_content += f"\n[registry.{_toml_string(host)}]\n  http = true\n"
+    return config_content, host
+
+
+async def _http_ready(port: int, path: str, timeout: float = 2, host: str = "127.0.0.1") -> bool:
+    """发送HTTP GET，收到2xx/3xx响应才视为就绪
+
+    docker-proxy在容器创建后即接受宿主机端口上的连接，与容器内应用是否监听无关，
+    因此仅能建立TCP连接不代表就绪；立即EOF或连接重置均视为未就绪。
+    """
+    request = f"GET {path} HTTP/1.0\r\nHost: {host}:{port}\r\nConnection: close\r\n\r\n"
+    writer = None
+    try:
+        reader, writer = await asyncio.wait_for(asyncio.open_connection(host, port), timeout)
+        writer.write(request.encode())
+        await writer.drain()
+        status_line = await asyncio.wait_for(reader.readline(), timeout)
+    except (OSError, asyncio.TimeoutError):
+        return False
+    finally:
+        if writer is not None:
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except OSError:
+                pass
+
+    # 状态行形如 "HTTP/1.1 200 OK"，连接被直接关闭时为空
+    match = re.match(rb"HTTP/\d(?:\.\d)? (\d{3})\b", status_line)
+    return bool(match) and 200 <= int(match.group(1)) < 400
+
+
+def _command_succeeds(cmd) -> bool:
+    """执行命令并判断是否成功退出"""
+    try:
+        completed = subprocess.run(
+            cmd, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, timeout=PROBE_TIMEOUT
+        )
+        return completed.returncode == 0
+    except (OSError, subprocess.SubprocessError):
+        return False
+
+
+@functools.lru_cache(maxsize=1)
+def _probe_docker_env() -> DockerEnvironment:
+    """探测Docker守护进程与Compose，同一进程内只执行一次"""
+    if shutil.which("docker") is None:
+        return DockerEnvironment(docker_available=False, docker_running=False)
+
+    probes: List[Tuple[str, List[str]]] = [
+        # docker version 在守护进程不可用时直接失败，比 docker info 快得多
+        ("docker_running", ["docker", "version", "--format", "{{.Server.Version}}"]),
+        # 优先使用 docker compose (v2 Go插件)，仅在插件缺失时回退到旧版 docker-compose
+        ("compose_v2", ["docker", "compose", "version"]),
+        ("compose_v1", ["docker-compose", "--version"]),
+    ]
+
+    # 各探测相互独立，并行执行，总耗时取决于最慢的一项
+    with ThreadPoolExecutor(max_workers=len(probes)) as executor:
+        futures = {executor.submit(_command_succeeds, argv): name for name, argv in probes}
+        results = {futures[future]: future.result() for future in as_completed(futures)}
+
+    if results["compose_v2"]:
+        compose_command = ("docker", "compose")
+    elif results["compose_v1"]:
+        compose_command = ("docker-compose",)
+    else:
+        compose_command = ()
+
+    return DockerEnvironment(
+        docker_available=True,
+        docker_running=results["docker_running"],
+        compose_command=compose_command,
+    )
+
+
+@functools.lru_cache(maxsize=None)
+def _detect_source_environment(cwd: str) -> bool:
+    """检查目录是否为源码环境，结果按目录在进程内缓存"""
+    # 多数非源码目录没有pyproject.toml，一次stat即可排除
+    try:
+        st = os.stat(os.path.join(cwd, "pyproject.toml"))
+    except OSError:
+        return False
+
+    return (
+        stat.S_ISREG(st.st_mode)
+        and os.path.isdir(os.path.join(cwd, "src", "aiforge"))
+        and os.path.isfile(os.path.join(cwd, "docker-compose.yml"))
+    )
+
 
 class DockerDeploymentProvider(BaseDeploymentProvider):
     """Docker部署提供商"""
 
+    # docker-compose.yml 中需要本地构建镜像的服务
+    BUILT_SERVICES = ("aiforge-core", "aiforge-web")
+
+    # docker-compose.yml 中的全部profile，所有服务都属于其中之一
+    COMPOSE_PROFILES = ("core", "web", "search")
+
     def __init__(self, config_manager):
         super().__init__(config_manager)
         self.deployment_type = "docker"
@@ -20,6 +252,15 @@ class DockerDeploymentProvider(BaseDeploymentProvider):
         # 获取Docker配置
         self.docker_config = config_manager.get_docker_config()
 
+        # Docker SDK客户端，首次使用时创建
+        self._docker_client = None
+
+        # 已存在的AIForge镜像，环境检查与构建步骤共享
+        self._aiforge_images_cache: Optional[List[str]] = None
+
+        # Docker Hub镜像加速地址（拉取式缓存），用于构建时拉取基础镜像
+        self.registry_mirror = os.environ.get("AIFORGE_REGISTRY_MIRROR")
+
         # 设置compose文件路径
         if self._is_source_environment():
             self.compose_file = "docker-compose.yml"
@@ -28,14 +269,19 @@ class DockerDeploymentProvider(BaseDeploymentProvider):
             self.compose_file = self._get_template_path("docker-compose.yml")
             self.dev_compose_file = self._get_template_path("docker-compose.dev.yml")
 
+        # compose文件是否定义了SearXNG服务，不包含时跳过其配置更新
+        self._has_searxng = self._compose_defines_searxng()
+
+    def _compose_defines_searxng(self) -> bool:
+        """检查compose文件中是否包含SearXNG服务"""
+        try:
+            return b"searxng" in Path(self.compose_file).read_bytes()
+        except OSError:
+            return False
+
     def _is_source_environment(self) -> bool:
         """检查是否在源码环境"""
-        current_dir = Path.cwd()
-        return (
-            (current_dir / "src" / "aiforge").exists()
-            and (current_dir / "docker-compose.yml").exists()
-            and (current_dir / "pyproject.toml").exists()
-        )
+        return _detect_source_environment(os.getcwd())
 
     def _get_template_path(self, filename: str) -> str:
         """获取模板文件路径"""
@@ -47,11 +293,112 @@ class DockerDeploymentProvider(BaseDeploymentProvider):
         except Exception:
             return filename
 
+    def _aiforge_image_refs(self) -> Tuple[str, ...]:
+        """根据compose文件推导AIForge构建镜像的标签"""
+        # compose以compose文件所在目录名作为默认项目名，可被COMPOSE_PROJECT_NAME覆盖
+        project = (
+            os.environ.get("COMPOSE_PROJECT_NAME") or Path(self.compose_file).resolve().parent.name
+        )
+        project = re.sub(r"[^a-z0-9_-]", "", project.lower())
+
+        refs = []
+        for service in self.BUILT_SERVICES:
+            # compose v2 使用 "-" 连接，v1 使用 "_"
+            refs.append(f"{project}-{service}:latest")
+            refs.append(f"{project}_{service}:latest")
+        return tuple(refs)
+
+    async def _image_exists(self, ref: str) -> bool:
+        """检查指定镜像是否存在"""
+        process = await asyncio.create_subprocess_exec(
+            "docker",
+            "image",
+            "inspect",
+            "--format",
+            "{{.Id}}",
+            ref,
+            stdout=asyncio.subprocess.DEVNULL,
+            stderr=asyncio.subprocess.DEVNULL,
+        )
+        try:
+            await asyncio.wait_for(process.wait(), timeout=PROBE_TIMEOUT)
+        except asyncio.TimeoutError:
+            process.kill()
+            await process.wait()
+            return False
+        return process.returncode == 0
+
+    async def _list_aiforge_images(self, force: bool = False) -> List[str]:
+        """列出已存在的AIForge构建镜像，结果在实例内缓存，force=True时重新检查"""
+        if self._aiforge_images_cache is None or force:
+            refs = self._aiforge_image_refs()
+            results = await asyncio.gather(*(self._image_exists(ref) for ref in refs))
+            self._aiforge_images_cache = [ref for ref, exists in zip(refs, results) if exists]
+        return self._aiforge_images_cache
+
+    @property
+    def _compose(self) -> List[str]:
+        """compose命令前缀，优先 docker compose (v2)"""
+        return list(_probe_docker_env().compose_command or ("docker-compose",))
+
+    def _get_docker_client(self):
+        """获取Docker SDK客户端，与docker CLI连接同一个守护进程"""
+        if self._docker_client is None:
+            import docker
+
+            if os.environ.get("DOCKER_HOST"):
+                self._docker_client = docker.from_env()
+            else:
+                # from_env() 只读取DOCKER_HOST，需按当前context（Colima、rootless等）取得端点
+                from docker.context import ContextAPI
+
+                context = ContextAPI.get_context(os.environ.get("DOCKER_CONTEXT"))
+                if context is None:
+                    raise RuntimeError("Docker context not found")
+                self._docker_client = docker.DockerClient(
+                    base_url=context.Host, tls=context.TLSConfig
+                )
+        return self._docker_client
+
+    def _try_docker_client(self):
+        """获取Docker SDK客户端，不可用时返回None以便回退到docker CLI"""
+        try:
+            return self._get_docker_client()
+        except Exception:
+            return None
+
+    async def _run_docker_cli(self, *args: str) -> str:
+        """执行docker CLI命令并返回标准输出，失败时抛出异常"""
+        process = await asyncio.create_subprocess_exec(
+            "docker", *args, stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE
+        )
+        stdout, stderr = await process.communicate()
+        if process.returncode != 0:
+            raise RuntimeError(stderr.decode().strip())
+        return stdout.decode()
+
+    async def _prune(self, resource: str, filters: Optional[Dict[str, str]] = None) -> None:
+        """清理未使用的image/volume/builder资源，SDK不可用时回退到 docker <resource> prune"""
+        client = self._try_docker_client()
+        if client is None:
+            args = [resource, "prune", "-f"]
+            for key, value in (filters or {}).items():
+                args.extend(["--filter", f"{key}={value}"])
+            await self._run_docker_cli(*args)
+        elif resource == "builder":
+            await asyncio.to_thread(client.api.prune_builds)
+        elif resource == "image":
+            await asyncio.to_thread(client.images.prune, filters=filters)
+        else:
+            await asyncio.to_thread(client.volumes.prune, filters=filters)
+
     async def deploy(self, **kwargs) -> Dict[str, Any]:
         """部署Docker服务"""
         dev_mode = kwargs.get("dev_mode", False)
         enable_searxng = kwargs.get("enable_searxng", False)
         mode = kwargs.get("mode", "web")
+        recreate = kwargs.get("recreate", False)
+        no_cache = kwargs.get("no_cache", False)
 
         print(self._i18n_manager.t("docker.starting_services"))
         print("=" * 50)
@@ -79,7 +426,7 @@ class DockerDeploymentProvider(BaseDeploymentProvider):
             print(self._i18n_manager.t("docker.docker_not_running_help"))
             return {"success": False, "message": "Docker not running"}
 
-        if not checks["compose_available"]:
+        if not checks["docker_compose_available"]:
             print(f"\n{self._i18n_manager.t('docker.docker_compose_not_available_msg')}")
             return {"success": False, "message": "Docker Compose not available"}
 
@@ -95,14 +442,14 @@ class DockerDeploymentProvider(BaseDeploymentProvider):
         print("\n" + "=" * 50)
 
         # 2. 构建镜像（如果需要）
-        build_result = await self._build_images_if_needed(dev_mode)
+        build_result = await self._build_images_if_needed(dev_mode, no_cache)
         if not build_result["success"]:
             return build_result
 
         print("\n" + "=" * 50)
 
         # 3. 启动服务
-        start_result = await self._start_services(dev_mode, enable_searxng, mode)
+        start_result = await self._start_services(dev_mode, enable_searxng, mode, recreate)
 
         return start_result
 
@@ -119,57 +466,32 @@ class DockerDeploymentProvider(BaseDeploymentProvider):
             "aiforge_image_exists": False,
         }
 
-        # 检查Docker是否安装
-        try:
-            result = await asyncio.create_subprocess_exec(
-                "docker",
-                "--version",
-                stdout=asyncio.subprocess.PIPE,
-                stderr=asyncio.subprocess.PIPE,
-            )
-            await result.wait()
-            if result.returncode == 0:
-                checks["docker_available"] = True
-                print(self._i18n_manager.t("docker.docker_installed"))
-            else:
-                print(self._i18n_manager.t("docker.docker_not_installed"))
-                return {"success": False, "checks": checks}
-        except FileNotFoundError:
+        # 守护进程探测（进程内缓存）与镜像检查相互独立，并行执行后再按原顺序输出
+        env, aiforge_images = await asyncio.gather(
+            asyncio.to_thread(_probe_docker_env),
+            self._list_aiforge_images(),
+            return_exceptions=True,
+        )
+        if isinstance(env, BaseException):
+            raise env
+
+        if not env.docker_available:
             print(self._i18n_manager.t("docker.docker_not_in_path"))
             return {"success": False, "checks": checks}
+        checks["docker_available"] = True
+        print(self._i18n_manager.t("docker.docker_installed"))
 
-        # 检查Docker是否运行
-        try:
-            result = await asyncio.create_subprocess_exec(
-                "docker", "info", stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE
-            )
-            await result.wait()
-            if result.returncode == 0:
-                checks["docker_running"] = True
-                print(self._i18n_manager.t("docker.docker_running"))
-            else:
-                print(self._i18n_manager.t("docker.docker_not_running"))
-                return {"success": False, "checks": checks}
-        except Exception:
-            print(self._i18n_manager.t("docker.cannot_connect_docker"))
+        if not env.docker_running:
+            print(self._i18n_manager.t("docker.docker_not_running"))
             return {"success": False, "checks": checks}
+        checks["docker_running"] = True
+        print(self._i18n_manager.t("docker.docker_running"))
 
-        # 检查Docker Compose
-        try:
-            result = await asyncio.create_subprocess_exec(
-                "docker-compose",
-                "--version",
-                stdout=asyncio.subprocess.PIPE,
-                stderr=asyncio.subprocess.PIPE,
-            )
-            await result.wait()
-            if result.returncode == 0:
-                checks["docker_compose_available"] = True
-                print(self._i18n_manager.t("docker.docker_compose_available"))
-            else:
-                print(self._i18n_manager.t("docker.docker_compose_not_available"))
-        except FileNotFoundError:
-            print(self._i18n_manager.t("docker.docker_compose_not_installed"))
+        if env.compose_available:
+            checks["docker_compose_available"] = True
+            print(self._i18n_manager.t("docker.docker_compose_available"))
+        else:
+            print(self._i18n_manager.t("docker.docker_compose_not_available"))
 
         # 检查配置文件
         if Path(self.compose_file).exists():
@@ -185,25 +507,13 @@ class DockerDeploymentProvider(BaseDeploymentProvider):
             print(self._i18n_manager.t("docker.dev_compose_file_not_exists"))
 
         # 检查AIForge镜像
-        try:
-            result = await asyncio.create_subprocess_exec(
-                "docker",
-                "images",
-                "--format",
-                "{{.Repository}}:{{.Tag}}",
-                "--filter",
-                "reference=*aiforge*",
-                stdout=asyncio.subprocess.PIPE,
-                stderr=asyncio.subprocess.PIPE,
-            )
-            stdout, _ = await result.communicate()
-            if stdout.decode().strip():
-                checks["aiforge_image_exists"] = True
-                print(self._i18n_manager.t("docker.aiforge_image_exists"))
-            else:
-                print(self._i18n_manager.t("docker.aiforge_image_not_exists"))
-        except Exception:
+        if isinstance(aiforge_images, BaseException):
             print(self._i18n_manager.t("docker.cannot_check_image_status"))
+        elif aiforge_images:
+            checks["aiforge_image_exists"] = True
+            print(self._i18n_manager.t("docker.aiforge_image_exists"))
+        else:
+            print(self._i18n_manager.t("docker.aiforge_image_not_exists"))
 
         success = all(
             [
@@ -216,25 +526,15 @@ class DockerDeploymentProvider(BaseDeploymentProvider):
 
         return {"success": success, "checks": checks}
 
-    async def _build_images_if_needed(self, dev_mode: bool = False) -> Dict[str, Any]:
+    async def _build_images_if_needed(
+        self, dev_mode: bool = False, no_cache: bool = False
+    ) -> Dict[str, Any]:
         """智能构建镜像"""
         print(f"\n{self._i18n_manager.t('docker.building_images')}")
 
         try:
             # 检查是否需要构建
-            result = await asyncio.create_subprocess_exec(
-                "docker",
-                "images",
-                "--format",
-                "{{.Repository}}:{{.Tag}}",
-                "--filter",
-                "reference=*aiforge*",
-                stdout=asyncio.subprocess.PIPE,
-                stderr=asyncio.subprocess.PIPE,
-            )
-            stdout, _ = await result.communicate()
-
-            if stdout.decode().strip():
+            if await self._list_aiforge_images():
                 print(self._i18n_manager.t("docker.image_exists_skip_build"))
                 return {"success": True, "message": "Images already exist"}
 
@@ -242,45 +542,55 @@ class DockerDeploymentProvider(BaseDeploymentProvider):
             print(self._i18n_manager.t("docker.build_time_notice"))
 
             # 构建命令
-            cmd = ["docker-compose"]
+            cmd = [*self._compose]
             if dev_mode and Path(self.dev_compose_file).exists():
                 cmd.extend(["-f", self.compose_file, "-f", self.dev_compose_file])
             else:
                 cmd.extend(["-f", self.compose_file])
-            cmd.extend(["build", "--no-cache"])
+            cmd.append("build")
+            if no_cache:
+                # 默认复用层缓存，仅在显式要求时完全重建
+                cmd.append("--no-cache")
+
+            # 启用BuildKit并行构建（v1需通过docker CLI构建），使用plain输出便于逐行解析
+            env = {
+                **os.environ,
+                "DOCKER_BUILDKIT": "1",
+                "COMPOSE_DOCKER_CLI_BUILD": "1",
+                "BUILDKIT_PROGRESS": "plain",
+            }
+            mirror_builder = await self._prepare_registry_mirror()
+            if mirror_builder:
+                env["BUILDX_BUILDER"] = mirror_builder
 
             # 异步实时显示构建进度
             process = await asyncio.create_subprocess_exec(
-                *cmd, stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.STDOUT
+                *cmd, stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.STDOUT, env=env
             )
 
             print(self._i18n_manager.t("docker.build_progress"))
             output_lines = []
 
+            # 按块读取并自行切分行，不受StreamReader单行长度限制，也不会让子进程阻塞在管道上
+            pending = b""
             while True:
-                line = await process.stdout.readline()
-                if not line:
+                chunk = await process.stdout.read(BUILD_OUTPUT_CHUNK_SIZE)
+                if not chunk:
                     break
 
-                line_str = line.decode().strip()
-                if line_str:
-                    output_lines.append(line_str)
-                    if "Step" in line_str:
-                        print(f"🔧 {line_str}")
-                    elif "Successfully built" in line_str or "Successfully tagged" in line_str:
-                        print(f"✅ {line_str}")
-                    elif "ERROR" in line_str or "FAILED" in line_str:
-                        print(f"❌ {line_str}")
-                    elif any(
-                        keyword in line_str
-                        for keyword in ["Downloading", "Extracting", "Pull complete"]
-                    ):
-                        print(f"⬇️ {line_str}")
+                *lines, pending = (pending + chunk).split(b"\n")
+                for line in lines:
+                    self._report_build_line(line, output_lines)
+
+            if pending:
+                self._report_build_line(pending, output_lines)
 
             await process.wait()
 
             if process.returncode == 0:
                 print(self._i18n_manager.t("docker.build_success"))
+                # 构建完成后刷新镜像缓存
+                await self._list_aiforge_images(force=True)
                 return {
                     "success": True,
                     "message": "Build successful",
@@ -298,24 +608,102 @@ class DockerDeploymentProvider(BaseDeploymentProvider):
             print(self._i18n_manager.t("docker.build_exception", error=str(e)))
             return {"success": False, "message": f"Build exception: {str(e)}"}
 
+    async def _prepare_registry_mirror(self) -> Optional[str]:
+        """配置使用镜像加速的buildx构建器，返回构建器名称，未配置或失败时返回None"""
+        if not self.registry_mirror:
+            return None
+
+        mirror = self.registry_mirror.rstrip("/")
+        try:
+            config_content, host = _buildkit_mirror_config(mirror)
+            if urlsplit(f"//{host}").hostname in _LOOPBACK_HOSTS:
+                print(self._i18n_manager.t("docker.registry_mirror_loopback", mirror=mirror))
+
+            config_changed = (
+                not MIRROR_BUILDKIT_CONFIG.exists()
+                or MIRROR_BUILDKIT_CONFIG.read_text(encoding="utf-8") != config_content
+            )
+            if config_changed:
+                MIRROR_BUILDKIT_CONFIG.parent.mkdir(parents=True, exist_ok=True)
+                MIRROR_BUILDKIT_CONFIG.write_text(config_content, encoding="utf-8")
+
+            inspect = await asyncio.create_subprocess_exec(
+                "docker",
+                "buildx",
+                "inspect",
+                MIRROR_BUILDER_NAME,
+                stdout=asyncio.subprocess.DEVNULL,
+                stderr=asyncio.subprocess.DEVNULL,
+            )
+            builder_exists = await inspect.wait() == 0
+
+            if builder_exists and config_changed:
+                # 镜像地址变更后需要重建构建器才能生效
+                remove = await asyncio.create_subprocess_exec(
+                    "docker",
+                    "buildx",
+                    "rm",
+                    MIRROR_BUILDER_NAME,
+                    stdout=asyncio.subprocess.DEVNULL,
+                    stderr=asyncio.subprocess.DEVNULL,
+                )
+                await remove.wait()
+                builder_exists = False
+
+            if not builder_exists:
+                create = await asyncio.create_subprocess_exec(
+                    "docker",
+                    "buildx",
+                    "create",
+                    "--name",
+                    MIRROR_BUILDER_NAME,
+                    "--driver",
+                    "docker-container",
+                    "--config",
+                    str(MIRROR_BUILDKIT_CONFIG),
+                    stdout=asyncio.subprocess.DEVNULL,
+                    stderr=asyncio.subprocess.PIPE,
+                )
+                _, stderr = await create.communicate()
+                if create.returncode != 0:
+                    print(
+                        self._i18n_manager.t(
+                            "docker.registry_mirror_failed", error=stderr.decode().strip()
+                        )
+                    )
+                    return None
+
+        except Exception as e:
+            print(self._i18n_manager.t("docker.registry_mirror_failed", error=str(e)))
+            return None
+
+        print(self._i18n_manager.t("docker.registry_mirror_enabled", mirror=mirror))
+        return MIRROR_BUILDER_NAME
+
+    def _report_build_line(self, line: bytes, output_lines: List[str]) -> None:
+        """记录构建输出行，并按类型显示关键进度"""
+        line_str = line.decode(errors="replace").strip()
+        if not line_str:
+            return
+
+        output_lines.append(line_str)
+        match = BUILD_LINE_PATTERN.match(line_str)
+        if match:
+            print(f"{BUILD_LINE_ICONS[match.group(1)]} {line_str}")
+
     async def _start_services(
-        self, dev_mode: bool = False, enable_searxng: bool = False, mode: str = "web"
+        self,
+        dev_mode: bool = False,
+        enable_searxng: bool = False,
+        mode: str = "web",
+        recreate: bool = False,
     ) -> Dict[str, Any]:
         """启动Docker服务"""
         print(self._i18n_manager.t("docker.starting_services"))
 
         try:
-            # 先清理可能存在的旧容器
-            print(self._i18n_manager.t("docker.cleaning_old_containers"))
-            await asyncio.create_subprocess_exec(
-                "docker-compose",
-                "down",
-                stdout=asyncio.subprocess.PIPE,
-                stderr=asyncio.subprocess.PIPE,
-            )
-
             # 构建启动命令
-            cmd = ["docker-compose"]
+            cmd = [*self._compose]
             if dev_mode:
                 cmd.extend(["-f", self.compose_file, "-f", self.dev_compose_file])
                 print(self._i18n_manager.t("docker.dev_mode_start"))
@@ -339,7 +727,12 @@ class DockerDeploymentProvider(BaseDeploymentProvider):
             else:
                 print(self._i18n_manager.t("docker.searxng_not_enabled"))
 
-            cmd.extend(["up", "-d"])
+            # up -d 会自行协调已有容器，无需预先执行 down
+            cmd.extend(["up", "-d", "--remove-orphans"])
+            if recreate:
+                # 强制重建容器，仍然只需一次compose调用
+                print(self._i18n_manager.t("docker.cleaning_old_containers"))
+                cmd.extend(["--force-recreate", "--renew-anon-volumes"])
 
             # 异步执行启动命令
             process = await asyncio.create_subprocess_exec(
@@ -356,13 +749,18 @@ class DockerDeploymentProvider(BaseDeploymentProvider):
 
                 # 等待服务稳定
                 print(f"\\n{self._i18n_manager.t('docker.waiting_services')}")
-                await asyncio.sleep(10)
+                endpoints = self._service_endpoints(enable_searxng, mode)
+                if await self._wait_for_services(endpoints):
+                    print(self._i18n_manager.t("docker.services_ready"))
+                else:
+                    urls = ", ".join(f"http://127.0.0.1:{port}{path}" for port, path in endpoints)
+                    print(self._i18n_manager.t("docker.services_wait_timeout", urls=urls))
 
                 # 检查服务健康状态 - 需要传递mode参数
                 health_status = await self._check_services_health(enable_searxng, mode)
 
-                # 更新SearXNG配置（仅当启用时）
-                if enable_searxng:
+                # 更新SearXNG配置（仅当启用且compose文件包含SearXNG服务时）
+                if enable_searxng and self._has_searxng:
                     await self._check_and_update_searxng_formats()
 
                 print(f"\\n{self._i18n_manager.t('docker.startup_complete')}")
@@ -400,6 +798,37 @@ class DockerDeploymentProvider(BaseDeploymentProvider):
         if enable_searxng:
             print(self._i18n_manager.t("docker.searxng_url"))
 
+    def _service_endpoints(
+        self, enable_searxng: bool = False, mode: str = "web"
+    ) -> List[Tuple[int, str]]:
+        """获取需要等待就绪的宿主机端口及探测路径（与compose healthcheck一致）"""
+        endpoints = []
+        if mode == "web":
+            endpoints.append((int(os.environ.get("AIFORGE_WEB_PORT", 8000)), "/health"))
+        if enable_searxng:
+            endpoints.append((SEARXNG_PORT, "/"))
+        return endpoints
+
+    async def _wait_for_services(
+        self, endpoints: List[Tuple[int, str]], timeout: float = 60, interval: float = 0.5
+    ) -> bool:
+        """轮询服务HTTP接口，全部就绪时立即返回，超时返回False"""
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout
+        pending = list(endpoints)
+
+        while pending:
+            # 每轮并行探测所有未就绪服务
+            results = await asyncio.gather(*(_http_ready(port, path) for port, path in pending))
+            pending = [endpoint for endpoint, ready in zip(pending, results) if not ready]
+            if not pending:
+                break
+            if loop.time() >= deadline:
+                return False
+            await asyncio.sleep(interval)
+
+        return True
+
     async def _check_services_health(
         self, enable_searxng: bool = False, mode: str = "web"
     ) -> Dict[str, str]:
@@ -417,98 +846,190 @@ class DockerDeploymentProvider(BaseDeploymentProvider):
             services.extend(["aiforge-searxng", "aiforge-nginx"])
 
         health_status = {}
+        if not services:
+            return health_status
+
+        try:
+            status_map = await self._container_status_map(services)
+        except Exception:
+            for service in services:
+                health_status[service] = "unknown"
+                print(self._i18n_manager.t("docker.service_status_unknown", service=service))
+            return health_status
 
         for service in services:
-            try:
-                cmd = ["docker", "ps", "--filter", f"name={service}", "--format", "{{.Status}}"]
-                process = await asyncio.create_subprocess_exec(
-                    *cmd, stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE
+            status = status_map.get(service, "not found")
+            # SDK返回 "running"，docker ps 返回 "Up 3 minutes" 之类的状态文本
+            if status == "running" or status.startswith("Up"):
+                health_status[service] = "running"
+                print(self._i18n_manager.t("docker.service_running", service=service))
+            else:
+                health_status[service] = "stopped"
+                print(
+                    self._i18n_manager.t(
+                        "docker.service_not_running", service=service, status=status
+                    )
                 )
-                stdout, _ = await process.communicate()
 
-                status = stdout.decode().strip()
-                if "Up" in status:
-                    health_status[service] = "running"
-                    print(self._i18n_manager.t("docker.service_running", service=service))
-                else:
-                    health_status[service] = "stopped"
-                    print(
-                        self._i18n_manager.t(
-                            "docker.service_not_running", service=service, status=status
-                        )
-                    )
+        return health_status
 
-            except Exception:
-                health_status[service] = "unknown"
-                print(self._i18n_manager.t("docker.service_status_unknown", service=service))
+    async def _container_status_map(self, services: List[str]) -> Dict[str, str]:
+        """一次性获取容器名称到状态的映射，避免逐个服务调用 docker ps"""
+        client = self._try_docker_client()
+        if client is not None:
+            containers = await asyncio.to_thread(
+                client.containers.list, all=True, filters={"name": services}
+            )
+            return {container.name: container.status for container in containers}
 
-        return health_status
+        # SDK不可用时回退到单次 docker ps 调用，在本地按名称筛选
+        output = await self._run_docker_cli("ps", "-a", "--format", "{{.Names}}\t{{.Status}}")
+        return dict(line.split("\t", 1) for line in output.splitlines() if "\t" in line)
 
     async def _check_and_update_searxng_formats(self) -> bool:
         """更新SearXNG配置以支持多种输出格式"""
+        settings_file = SEARXNG_SETTINGS_FILE
+
         try:
-            import yaml
-        except ImportError:
-            print(self._i18n_manager.t("docker.pyyaml_not_installed"))
+            stat_result = settings_file.stat()
+        except FileNotFoundError:
+            print(self._i18n_manager.t("docker.searxng_config_not_exists"))
             return False
 
-        # 保持原始路径：根目录下的searxng/settings.yml
-        settings_file = Path("searxng/settings.yml")
+        # 文件自上次确认（标记文件记录）后未变化时直接跳过
+        if self._read_searxng_sentinel() == self._searxng_signature(stat_result):
+            print(self._i18n_manager.t("docker.searxng_config_latest"))
+            return False
 
-        if not settings_file.exists():
-            print(self._i18n_manager.t("docker.searxng_config_not_exists"))
+        try:
+            # 快速路径：按字节匹配规范写法，避免解析YAML。
+            # 标记文件只在完整解析确认后写入，避免快速路径的误判被长期缓存
+            if SEARXNG_FORMATS_PATTERN.search(settings_file.read_bytes()):
+                print(self._i18n_manager.t("docker.searxng_config_latest"))
+                return False
+
+            return self._update_searxng_formats(settings_file)
+
+        except Exception as e:
+            print(self._i18n_manager.t("docker.searxng_config_update_failed", error=str(e)))
             return False
 
+    def _update_searxng_formats(self, settings_file: Path) -> bool:
+        """完整解析SearXNG配置并在需要时写回，优先使用ruamel.yaml保留注释与顺序"""
         try:
-            with open(settings_file, "r", encoding="utf-8") as f:
-                config = yaml.safe_load(f)
+            from ruamel.yaml import YAML
+
+            round_trip = YAML()
+        except ImportError:
+            round_trip = None
 
-            if "search" not in config:
-                config["search"] = {}
+        if round_trip is None and not _HAS_YAML:
+            print(self._i18n_manager.t("docker.pyyaml_not_installed"))
+            return False
 
-            required_formats = ["html", "json", "csv", "rss"]
-            current_formats = config["search"].get("formats", [])
+        with open(settings_file, "r", encoding="utf-8") as f:
+            config = round_trip.load(f) if round_trip else yaml.safe_load(f)
 
-            if set(current_formats) != set(required_formats):
-                config["search"]["formats"] = required_formats
+        if "search" not in config:
+            config["search"] = {}
 
-                with open(settings_file, "w", encoding="utf-8") as f:
-                    yaml.dump(config, f, default_flow_style=False, allow_unicode=True)
+        current_formats = config["search"].get("formats", [])
 
-                print(self._i18n_manager.t("docker.searxng_config_updated"))
-                return True
-            else:
-                print(self._i18n_manager.t("docker.searxng_config_latest"))
-                return False
+        if set(current_formats) != set(SEARXNG_REQUIRED_FORMATS):
+            config["search"]["formats"] = list(SEARXNG_REQUIRED_FORMATS)
 
-        except Exception as e:
-            print(self._i18n_manager.t("docker.searxng_config_update_failed", error=str(e)))
+            with open(settings_file, "w", encoding="utf-8") as f:
+                if round_trip:
+                    round_trip.dump(config, f)
+                else:
+                    yaml.dump(config, f, default_flow_style=False, allow_unicode=True)
+
+            self._write_searxng_sentinel(settings_file.stat())
+            print(self._i18n_manager.t("docker.searxng_config_updated"))
+            return True
+        else:
+            self._write_searxng_sentinel(settings_file.stat())
+            print(self._i18n_manager.t("docker.searxng_config_latest"))
             return False
 
+    def _searxng_signature(self, stat_result: os.stat_result) -> str:
+        """所需格式列表的哈希与配置文件的大小、修改时间组成的签名"""
+        return f"{SEARXNG_FORMATS_HASH} {stat_result.st_size} {stat_result.st_mtime_ns}"
+
+    def _searxng_sentinel_file(self) -> Path:
+        """SearXNG配置确认标记文件，按配置文件绝对路径区分不同项目目录"""
+        settings_path = str(SEARXNG_SETTINGS_FILE.resolve())
+        digest = hashlib.sha256(settings_path.encode()).hexdigest()[:16]
+        return AIFORGE_STATE_DIR / f"searxng-formats-{digest}.ok"
+
+    def _read_searxng_sentinel(self) -> Optional[str]:
+        """读取SearXNG配置确认标记，不存在时返回None"""
+        try:
+            return self._searxng_sentinel_file().read_text(encoding="utf-8").strip()
+        except OSError:
+            return None
+
+    def _write_searxng_sentinel(self, stat_result: os.stat_result) -> None:
+        """记录完整解析已确认配置包含所需格式，写入失败不影响启动"""
+        try:
+            sentinel_file = self._searxng_sentinel_file()
+            sentinel_file.parent.mkdir(parents=True, exist_ok=True)
+            sentinel_file.write_text(self._searxng_signature(stat_result), encoding="utf-8")
+        except OSError:
+            pass
+
     # 其他必要的方法实现...
     async def stop(self) -> bool:
-        """停止服务"""
+        """停止服务，保留容器以便下次启动时直接复用"""
+        return await self._run_compose_lifecycle(
+            "stop", "docker.stopping_services", "docker.stop_success", "docker.stop_failed"
+        )
+
+    async def pause(self) -> bool:
+        """暂停服务容器，进程被冻结，无需销毁网络与cgroup"""
+        return await self._run_compose_lifecycle(
+            "pause", "docker.pausing_services", "docker.pause_success", "docker.pause_failed"
+        )
+
+    async def unpause(self) -> bool:
+        """恢复已暂停的服务容器"""
+        return await self._run_compose_lifecycle(
+            "unpause",
+            "docker.unpausing_services",
+            "docker.unpause_success",
+            "docker.unpause_failed",
+        )
+
+    async def _run_compose_lifecycle(
+        self, action: str, progress_key: str, success_key: str, failed_key: str
+    ) -> bool:
+        """执行compose生命周期命令（stop/pause/unpause）"""
         if not Path(self.compose_file).exists():
             print(self._i18n_manager.t("docker.compose_file_not_exists_msg"))
             return False
 
-        print(self._i18n_manager.t("docker.stopping_services"))
+        print(self._i18n_manager.t(progress_key))
 
         try:
-            cmd = ["docker-compose", "-f", self.compose_file, "down"]
+            cmd = [*self._compose, "-f", self.compose_file]
+            # 未激活profile的服务会被compose忽略，需启用全部profile才能作用于已启动的容器
+            for profile in self.COMPOSE_PROFILES:
+                cmd.extend(["--profile", profile])
+            cmd.append(action)
+
             process = await asyncio.create_subprocess_exec(
-                *cmd, stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE
+                *cmd, stdout=asyncio.subprocess.DEVNULL, stderr=asyncio.subprocess.DEVNULL
             )
             await process.wait()
 
             if process.returncode == 0:
-                print(self._i18n_manager.t("docker.stop_success"))
+                print(self._i18n_manager.t(success_key))
                 return True
             else:
-                print(self._i18n_manager.t("docker.stop_failed", error="Process failed"))
+                print(self._i18n_manager.t(failed_key, error="Process failed"))
                 return False
         except Exception as e:
-            print(self._i18n_manager.t("docker.stop_failed", error=str(e)))
+            print(self._i18n_manager.t(failed_key, error=str(e)))
             return False
 
     async def cleanup(self) -> bool:
@@ -517,31 +1038,20 @@ class DockerDeploymentProvider(BaseDeploymentProvider):
 
         try:
             # 停止并移除容器
-            cmd1 = ["docker-compose", "down", "-v"]
+            cmd1 = [*self._compose, "down", "-v"]
             process1 = await asyncio.create_subprocess_exec(
-                *cmd1, stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE
+                *cmd1, stdout=asyncio.subprocess.DEVNULL, stderr=asyncio.subprocess.DEVNULL
             )
             await process1.wait()
 
-            cmd2 = ["docker-compose", "--profile", "searxng", "down", "-v", "--remove-orphans"]
+            cmd2 = [*self._compose, "--profile", "searxng", "down", "-v", "--remove-orphans"]
             process2 = await asyncio.create_subprocess_exec(
-                *cmd2, stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE
+                *cmd2, stdout=asyncio.subprocess.DEVNULL, stderr=asyncio.subprocess.DEVNULL
             )
             await process2.wait()
 
             # 清理相关镜像
-            cmd3 = [
-                "docker",
-                "image",
-                "prune",
-                "-f",
-                "--filter",
-                "label=com.docker.compose.project=aiforge",
-            ]
-            process3 = await asyncio.create_subprocess_exec(
-                *cmd3, stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE
-            )
-            await process3.wait()
+            await self._prune("image", {"label": "com.docker.compose.project=aiforge"})
 
             print(self._i18n_manager.t("docker.cleanup_success"))
             return True
@@ -555,59 +1065,39 @@ class DockerDeploymentProvider(BaseDeploymentProvider):
         print(self._i18n_manager.t("docker.deep_cleanup_warning"))
 
         try:
-            # 1. 停止所有服务
+            # 1. 停止所有服务（需等待完成，否则容器仍占用待删除的镜像）
             print(self._i18n_manager.t("docker.stopping_all_services"))
-            await asyncio.create_subprocess_exec(
-                "docker-compose",
+            process1 = await asyncio.create_subprocess_exec(
+                *self._compose,
                 "down",
                 "-v",
                 "--remove-orphans",
-                stdout=asyncio.subprocess.PIPE,
-                stderr=asyncio.subprocess.PIPE,
+                stdout=asyncio.subprocess.DEVNULL,
+                stderr=asyncio.subprocess.DEVNULL,
             )
-            await asyncio.create_subprocess_exec(
-                "docker-compose",
+            await process1.wait()
+            process2 = await asyncio.create_subprocess_exec(
+                *self._compose,
                 "--profile",
                 "searxng",
                 "down",
                 "-v",
                 "--remove-orphans",
-                stdout=asyncio.subprocess.PIPE,
-                stderr=asyncio.subprocess.PIPE,
+                stdout=asyncio.subprocess.DEVNULL,
+                stderr=asyncio.subprocess.DEVNULL,
             )
+            await process2.wait()
 
             # 2. 只清理AIForge构建的镜像，保留基础镜像
             print(self._i18n_manager.t("docker.cleaning_built_images"))
             await self._remove_aiforge_built_images_only()
 
-            # 3. 清理构建缓存
+            # 3. 清理构建缓存与悬空资源：三者是相互独立的守护进程操作，并行执行
+            # （放在镜像删除之后，才能回收删除镜像后遗留的悬空层）
             print(self._i18n_manager.t("docker.cleaning_build_cache"))
-            await asyncio.create_subprocess_exec(
-                "docker",
-                "builder",
-                "prune",
-                "-f",
-                stdout=asyncio.subprocess.PIPE,
-                stderr=asyncio.subprocess.PIPE,
-            )
-
-            # 4. 清理悬空资源
             print(self._i18n_manager.t("docker.cleaning_dangling_resources"))
-            await asyncio.create_subprocess_exec(
-                "docker",
-                "image",
-                "prune",
-                "-f",
-                stdout=asyncio.subprocess.PIPE,
-                stderr=asyncio.subprocess.PIPE,
-            )
-            await asyncio.create_subprocess_exec(
-                "docker",
-                "volume",
-                "prune",
-                "-f",
-                stdout=asyncio.subprocess.PIPE,
-                stderr=asyncio.subprocess.PIPE,
+            await asyncio.gather(
+                self._prune("builder"), self._prune("image"), self._prune("volume")
             )
 
             print(self._i18n_manager.t("docker.deep_cleanup_success"))
@@ -620,46 +1110,72 @@ class DockerDeploymentProvider(BaseDeploymentProvider):
     async def _remove_aiforge_built_images_only(self):
         """只移除AIForge构建的镜像，保留基础镜像"""
         try:
-            result = await asyncio.create_subprocess_exec(
-                "docker",
-                "images",
-                "--format",
-                "{{.Repository}}:{{.Tag}}\t{{.ID}}",
-                stdout=asyncio.subprocess.PIPE,
-                stderr=asyncio.subprocess.PIPE,
-            )
-            stdout, _ = await result.communicate()
-
-            if not stdout or not stdout.decode().strip():
-                return
+            images = await self._list_image_repos("*aiforge*")
 
+            # 保留的基础镜像：重新拉取代价最高，也是配置AIFORGE_REGISTRY_MIRROR后受益最大的镜像
             preserve_images = {"python", "searxng/searxng", "nginx"}
             images_to_remove = []
 
-            for line in stdout.decode().strip().split("\n"):
-                if "\t" in line:
-                    repo_tag, image_id = line.split("\t", 1)
-                    repo = repo_tag.split(":")[0]
-
-                    if any(keyword in repo.lower() for keyword in ["aiforge"]):
-                        if not any(base in repo.lower() for base in preserve_images):
-                            images_to_remove.append(image_id)
+            for image_id, repos in images.items():
+                if any(
+                    "aiforge" in repo and not any(base in repo for base in preserve_images)
+                    for repo in repos
+                ):
+                    images_to_remove.append(image_id)
+
+            # 并行删除镜像，单个镜像删除失败（如仍被其他项目的容器使用）不影响其余镜像
+            results = await asyncio.gather(
+                *(self._remove_image(image_id) for image_id in images_to_remove),
+                return_exceptions=True,
+            )
+            self._aiforge_images_cache = None
 
-            # 删除镜像
-            for image_id in images_to_remove:
-                await asyncio.create_subprocess_exec(
-                    "docker",
-                    "rmi",
-                    "-f",
-                    image_id,
-                    stdout=asyncio.subprocess.PIPE,
-                    stderr=asyncio.subprocess.PIPE,
-                )
+            errors = [str(result) for result in results if isinstance(result, Exception)]
+            removed = len(results) - len(errors)
 
-            if images_to_remove:
-                print(self._i18n_manager.t("docker.removed_images", count=len(images_to_remove)))
-            else:
+            if removed:
+                print(self._i18n_manager.t("docker.removed_images", count=removed))
+            elif not errors:
                 print(self._i18n_manager.t("docker.no_images_to_remove"))
+            if errors:
+                print(
+                    self._i18n_manager.t(
+                        "docker.remove_images_failed", count=len(errors), error="; ".join(errors)
+                    )
+                )
 
         except Exception as e:
             print(self._i18n_manager.t("docker.cleanup_images_error", error=str(e)))
+
+    async def _list_image_repos(self, reference: str) -> Dict[str, List[str]]:
+        """列出匹配reference的镜像，返回镜像ID到小写仓库名列表的映射"""
+        client = self._try_docker_client()
+        if client is not None:
+            images = await asyncio.to_thread(client.images.list, filters={"reference": reference})
+            return {
+                image.id: [tag.rsplit(":", 1)[0].lower() for tag in image.tags] for image in images
+            }
+
+        # SDK不可用时回退到 docker images，同一镜像的多个标签各占一行
+        output = await self._run_docker_cli(
+            "images",
+            "--no-trunc",
+            "--filter",
+            f"reference={reference}",
+            "--format",
+            "{{.ID}}\t{{.Repository}}",
+        )
+        images: Dict[str, List[str]] = {}
+        for line in output.splitlines():
+            if "\t" in line:
+                image_id, repo = line.split("\t", 1)
+                images.setdefault(image_id, []).append(repo.lower())
+        return images
+
+    async def _remove_image(self, image_id: str) -> None:
+        """强制删除镜像，SDK不可用时回退到 docker rmi -f"""
+        client = self._try_docker_client()
+        if client is not None:
+            await asyncio.to_thread(client.api.remove_image, image_id, force=True)
+        else:
+            await self._run_docker_cli("rmi", "-f", image_id)
@@ -0,0 +1,171 @@
+import asyncio
+
+import pytest
+
+from aiforge_deploy.docker.docker_provider import (
+    BUILD_LINE_ICONS,
+    BUILD_LINE_PATTERN,
+    SEARXNG_FORMATS_PATTERN,
+    _buildkit_mirror_config,
+    _http_ready,
+)
+
+
+def _formats_ok(settings: str) -> bool:
+    return SEARXNG_FORMATS_PATTERN.search(settings.encode()) is not None
+
+
+@pytest.mark.parametrize(
+    "settings",
+    [
+        "search:\n  formats: [html, json, csv, rss]\n",
+        "search:\n  formats:\n    - html\n    - json\n    - csv\n    - rss\n",
+        "search:\n  formats:\n  - html\n  - json\n  - csv\n  - rss\n",
+        "search:\r\n  formats:\r\n    - html\r\n    - json\r\n    - csv\r\n    - rss\r\n",
+        "search:\n  formats:\n    - html\n    - json\n    - csv\n    - rss",
+        "general:\n  debug: false\n\nsearch:\n  safe_search: 0\n\n"
+        "  autocomplete_cfg:\n    backend: duckduckgo\n"
+        "  formats: [html,json,csv,rss]\n  default_lang: auto\nui:\n  theme: simple\n",
+    ],
+)
+def test_searxng_formats_pattern_matches_canonical_settings(settings):
+    """规范写法的search.formats可直接确认，无需解析YAML"""
+    assert _formats_ok(settings)
+
+
+@pytest.mark.parametrize(
+    "settings",
+    [
+        # 嵌套更深的同名键不是search.formats
+        "search:\n  engines_cfg:\n    formats: [html, json, csv, rss]\n  formats:\n    - html\n",
+        "search:\n  engines_cfg:\n    formats:\n      - html\n      - json\n      - csv\n"
+        "      - rss\n  formats: [html]\n",
+        # 其他顶层键下的formats
+        "search:\n  safe_search: 0\nui:\n  formats: [html, json, csv, rss]\n",
+        # 缺少或多出格式
+        "search:\n  formats: [html]\n",
+        "search:\n  formats:\n    - html\n    - json\n    - csv\n",
+        "search:\n  formats:\n    - html\n    - json\n    - csv\n    - rss\n    - xml\n",
+        "search:\n  formats:\n    - html\n    - json\n    - csv\n    - rss\n\n    - xml\n",
+        # 续行会改变最后一项的值
+        "search:\n  formats:\n    - html\n    - json\n    - csv\n    - rss\n      feed\n",
+        # 列表项缩进不一致
+        "search:\n  formats:\n    - html\n      - json\n    - csv\n    - rss\n",
+        "search:\n  formats: [html, html, html, html]\n",
+    ],
+)
+def test_searxng_formats_pattern_rejects_other_settings(settings):
+    """无法确认的写法必须回退到完整解析"""
+    assert not _formats_ok(settings)
+
+
+@pytest.mark.parametrize(
+    "line, key",
+    [
+        ("Step 3/12 : RUN pip install .", "Step"),
+        ("#8 [builder 2/5] RUN apt-get update", "["),
+        ("#8 12.34 ERROR: failed to solve", "ERROR"),
+        ("Successfully built 0123456789ab", "Successfully built"),
+        ("Successfully tagged package-aiforge-web:latest", "Successfully tagged"),
+        ("0123456789ab: Pull complete", "Pull complete"),
+        ("0123456789ab: Downloading [=====>   ]  1.2MB/5MB", "Downloading"),
+        ("#12 FAILED", "FAILED"),
+    ],
+)
+def test_build_line_pattern_classifies_progress_lines(line, key):
+    match = BUILD_LINE_PATTERN.match(line)
+    assert match is not None
+    assert match.group(1) == key
+    assert key in BUILD_LINE_ICONS
+
+
+@pytest.mark.parametrize(
+    "line",
+    [
+        "#8 12.34 Collecting requests",
+        "#5 DONE 0.3s",
+        " ---> Running in 0123456789ab",
+        "Removing intermediate container 0123456789ab",
+    ],
+)
+def test_build_line_pattern_skips_other_lines(line):
+    assert BUILD_LINE_PATTERN.match(line) is None
+
+
+async def _probe_local_server(response: bytes) -> bool:
+    """启动本地服务器返回指定响应（为空时立即断开），并探测其就绪状态"""
+
+    async def handle(reader, writer):
+        await reader.readline()
+        writer.write(response)
+        await writer.drain()
+        writer.close()
+
+    server = await asyncio.start_server(handle, "127.0.0.1", 0)
+    port = server.sockets[0].getsockname()[1]
+    async with server:
+        return await _http_ready(port, "/health")
+
+
+@pytest.mark.parametrize(
+    "response, ready",
+    [
+        (b"HTTP/1.1 200 OK\r\nContent-Length: 0\r\n\r\n", True),
+        (b"HTTP/1.1 204\r\n\r\n", True),
+        (b"HTTP/1.0 302 Found\r\nLocation: /\r\n\r\n", True),
+        # nginx在SearXNG尚未启动时返回502
+        (b"HTTP/1.1 502 Bad Gateway\r\n\r\n", False),
+        (b"HTTP/1.1 404 Not Found\r\n\r\n", False),
+        # docker-proxy接受连接后立即断开
+        (b"", False),
+        (b"\r\n", False),
+    ],
+)
+def test_http_ready_requires_successful_status(response, ready):
+    assert asyncio.run(_probe_local_server(response)) is ready
+
+
+@pytest.mark.parametrize(
+    "mirror_url, config_content, host",
+    [
+        # 未指定协议时按https处理
+        (
+            "mirror.gcr.io",
+            '[registry."docker.io"]\n  mirrors = ["mirror.gcr.io"]\n',
+            "mirror.gcr.io",
+        ),
+        (
+            "https://mirror.gcr.io",
+            '[registry."docker.io"]\n  mirrors = ["mirror.gcr.io"]\n',
+            "mirror.gcr.io",
+        ),
+        # http拉取式缓存需声明 http = true
+        (
+            "http://registry.lan:5000",
+            '[registry."docker.io"]\n  mirrors = ["registry.lan:5000"]\n'
+            '\n[registry."registry.lan:5000"]\n  http = true\n',
+            "registry.lan:5000",
+        ),
+        # 保留路径，去掉末尾斜杠
+        (
+            "https://hub.example.com/v2/proxy/",
+            '[registry."docker.io"]\n  mirrors = ["hub.example.com/v2/proxy"]\n',
+            "hub.example.com",
+        ),
+        # 引号需转义
+        (
+            'http://a"b:5000',
+            '[registry."docker.io"]\n  mirrors = ["a\\"b:5000"]\n'
+            '\n[registry."a\\"b:5000"]\n  http = true\n',
+            'a"b:5000',
+        ),
+    ],
+)
+def test_buildkit_mirror_config(mirror_url, config_content, host):
+    assert _buildkit_mirror_config(mirror_url) == (config_content, host)
+
+
+@pytest.mark.parametrize("mirror_url", ["ftp://mirror.example.com", "http://", "https:///path"])
+def test_buildkit_mirror_config_rejects_invalid_urls(mirror_url):
+    with pytest.raises(ValueError):
+        _buildkit_mirror_config(mirror_url)